@@ -65,9 +65,6 @@ See the [DEVELOPMENT_ROADMAP.md](DEVELOPMENT_ROADMAP.md) for implementation deta
 The system architecture is described in [OPTIMIZED_ARCHITECTURE.md](OPTIMIZED_ARCHITECTURE.md).
 """
     
-    with open("README.md", "w") as f:
-        f.write(readme_content)
-    
     # Create initial requirements.txt
     requirements_content = """# Core dependencies
 watchdog>=2.1.6
@@ -75,7 +72,7 @@ psutil>=5.9.0
 pandas>=1.3.5
 numpy>=1.21.5
 scikit-learn>=1.0.2
-pyyaml>=6.0
+pyyaml>=6.0  # install libyaml first to enable the faster CSafeLoader
 PyQt5>=5.15.6
 
 # Development dependencies
@@ -84,9 +81,6 @@ flake8>=4.0.1
 black>=22.3.0
 """
     
-    with open("requirements.txt", "w") as f:
-        f.write(requirements_content)
-    
     # Create example config
     example_config_content = """# Example configuration file
 # Copy this to config.yaml and edit for your environment
@@ -128,16 +122,15 @@ privacy:
   collect_window_titles: false
 """
     
-    with open("config/example_config.yaml", "w") as f:
-        f.write(example_config_content)
-    
     # Create main.py
     main_content = """#!/usr/bin/env python3
 # Main application entry point
 
 import os
 import sys
+import signal
 import logging
+import threading
 from pathlib import Path
 
 # Setup logging
@@ -177,13 +170,21 @@ def main():
     
     logger.info("Application started successfully")
     
-    # For command-line operation, we can add a simple loop here
+    # For command-line operation, run until SIGINT/SIGTERM
     # In GUI mode, this would be handled by the UI event loop
+    stop_event = threading.Event()
+    
+    def _handle_signal(signum, frame):
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+    
     try:
-        # This is a placeholder - in the real app, we'd use the UI event loop
-        input("Press Enter to exit...\n")
-    except KeyboardInterrupt:
-        pass
+        logger.info("Press Ctrl+C to exit")
+        # Wait in short slices so signals are handled promptly on every platform
+        while not stop_event.wait(1.0):
+            pass
     finally:
         logger.info("Shutting down...")
         controller.stop()
@@ -194,9 +195,6 @@ if __name__ == "__main__":
     main()
 """
     
-    with open("src/main.py", "w") as f:
-        f.write(main_content)
-    
     # Create .gitignore
     gitignore_content = """# Python
 __pycache__/
@@ -232,15 +230,28 @@ ENV/
 
 # Application specific
 /data/*.db
+/data/*.db-wal
+/data/*.db-shm
 /data/models/
+/data/blobs/
 /config/config.yaml
+/config/*.cache.json
 /logs/
 .coverage
 htmlcov/
 """
     
-    with open(".gitignore", "w") as f:
-        f.write(gitignore_content)
+    
+    # Directories already exist from create_project_structure()
+    files = [
+        (Path("README.md"), readme_content),
+        (Path("requirements.txt"), requirements_content),
+        (Path("config/example_config.yaml"), example_config_content),
+        (Path("src/main.py"), main_content),
+        (Path(".gitignore"), gitignore_content),
+    ]
+    for path, content in files:
+        path.write_text(content)
     
     print("Initial files created successfully!")
 
@@ -254,6 +265,12 @@ import logging
 import yaml
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger("ai-framework.controller")
 
 class ApplicationController:
@@ -272,8 +289,8 @@ class ApplicationController:
         """Load configuration from file."""
         logger.info(f"Loading configuration from {config_path}")
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            with open(config_path, 'rb') as f:
+                config = yaml.load(f, Loader=_SafeLoader)
             return config
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
@@ -336,19 +353,29 @@ class ApplicationController:
         logger.info("Application stopped")
         return True
 """
-    
-    with open("src/core/controller.py", "w") as f:
-        f.write(controller_content)
 
     # Config
     config_content = """# Configuration management
 import os
+import copy
+import json
 import logging
 import yaml
+from collections import OrderedDict
 from pathlib import Path
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger("ai-framework.config")
 
+# Parsed configs keyed by absolute path -> (mtime_ns, size, config), LRU-bounded
+_YAML_CACHE = OrderedDict()
+_YAML_CACHE_MAX = 100
+
 class ConfigManager:
     """Manages loading and validating configuration."""
     
@@ -367,8 +394,7 @@ class ConfigManager:
         """Load configuration from file."""
         logger.info(f"Loading configuration from {self.config_path}")
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = self._load_cached()
             
             # Validate configuration
             self.validate()
@@ -378,6 +404,59 @@ class ConfigManager:
             logger.error(f"Error loading configuration: {e}")
             raise
     
+    def _load_cached(self):
+        """Parse the config file, reusing the last parse if the file is unchanged."""
+        key = os.path.abspath(self.config_path)
+        st = os.stat(key)
+        
+        cached = _YAML_CACHE.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            _YAML_CACHE.move_to_end(key)
+            return copy.deepcopy(cached[2])
+        
+        config = self._read_json_cache(key, st)
+        if config is None:
+            with open(key, 'rb') as f:
+                config = yaml.load(f, Loader=_SafeLoader)
+            self._write_json_cache(key, st, config)
+        
+        _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, config)
+        _YAML_CACHE.move_to_end(key)
+        if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+            _YAML_CACHE.popitem(last=False)
+        
+        # Hand back a copy so validate() and callers cannot mutate the cached entry
+        return copy.deepcopy(config)
+    
+    def _read_json_cache(self, key, st):
+        """Return the config from the sibling JSON cache, or None if stale or missing."""
+        cache_path = key + '.cache.json'
+        try:
+            with open(cache_path, 'r') as f:
+                header = json.loads(f.readline())
+                if header.get('__src') != [st.st_mtime_ns, st.st_size]:
+                    return None
+                return json.load(f)
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def _write_json_cache(self, key, st, config):
+        """Write the parsed config as JSON next to the YAML file."""
+        cache_path = key + '.cache.json'
+        try:
+            body = json.dumps(config)
+            # Only cache configs that survive a JSON round trip unchanged
+            if json.loads(body) != config:
+                return
+            
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps({'__src': [st.st_mtime_ns, st.st_size]}) + '\\n')
+                f.write(body)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not write config cache {cache_path}: {e}")
+    
     def validate(self):
         """Validate configuration structure and values."""
         # Basic validation
@@ -418,8 +497,13 @@ class ConfigManager:
         return self.config.get(key, default)
 """
     
-    with open("src/core/config.py", "w") as f:
-        f.write(config_content)
+    
+    files = [
+        (Path("src/core/controller.py"), controller_content),
+        (Path("src/core/config.py"), config_content),
+    ]
+    for path, content in files:
+        path.write_text(content)
     
     print("Core files created successfully!")
 
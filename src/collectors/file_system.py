@@ -1,14 +1,55 @@
 # File System Collector
+import os
 import time
+import functools
 import logging
-from pathlib import Path
+import threading
+from collections import deque
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import (
+    EVENT_TYPE_CREATED,
+    EVENT_TYPE_DELETED,
+    EVENT_TYPE_MODIFIED,
+    EVENT_TYPE_MOVED,
+    FileSystemEventHandler,
+)
 
 from src.collectors.base import DataCollector
 
 logger = logging.getLogger("ai-framework.collectors.file_system")
 
+# Watchdog event types mapped to the operation names used in config and storage
+_OP_MAP = {
+    EVENT_TYPE_CREATED: "create",
+    EVENT_TYPE_MODIFIED: "modify",
+    EVENT_TYPE_DELETED: "delete",
+    EVENT_TYPE_MOVED: "move",
+}
+
+class FileEvent:
+    """A single file system event, stored without a per-instance dict."""
+    
+    __slots__ = ("timestamp", "operation", "path", "file_type", "size", "app")
+    
+    def __init__(self, timestamp, operation, path, file_type, size, app=""):
+        self.timestamp = timestamp
+        self.operation = operation
+        self.path = path
+        self.file_type = file_type
+        self.size = size
+        self.app = app
+    
+    def __getitem__(self, key):
+        """Allow dict-style field access; storage reads the attributes directly."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"FileEvent({fields})"
+
+
 class FileSystemEventProcessor(FileSystemEventHandler):
     """Process file system events."""
     
@@ -21,44 +62,32 @@ class FileSystemEventProcessor(FileSystemEventHandler):
         """
         self.collector = collector
     
-    def on_created(self, event):
-        """Process file creation event."""
-        if event.is_directory:
-            return
+    def dispatch(self, event):
+        """
+        Route a watchdog event to _process_event if its operation is enabled.
         
-        self._process_event(event.src_path, "create")
-    
-    def on_modified(self, event):
-        """Process file modification event."""
-        if event.is_directory:
-            return
+        Directories and excluded paths are filtered here, before any event
+        record is built.
         
-        if "modify" not in self.collector.monitored_events:
-            return
-            
-        self._process_event(event.src_path, "modify")
-    
-    def on_deleted(self, event):
-        """Process file deletion event."""
+        Args:
+            event: watchdog FileSystemEvent
+        """
         if event.is_directory:
             return
         
-        if "delete" not in self.collector.monitored_events:
-            return
-            
-        self._process_event(event.src_path, "delete")
-    
-    def on_moved(self, event):
-        """Process file move event."""
-        if event.is_directory:
+        operation = _OP_MAP.get(event.event_type)
+        if operation not in self.collector._enabled_ops:
             return
         
-        if "move" not in self.collector.monitored_events:
-            return
-            
-        # Record as delete of source and create of destination
-        self._process_event(event.src_path, "delete")
-        self._process_event(event.dest_path, "create")
+        is_excluded = self.collector.is_path_excluded
+        if operation == "move":
+            # Record as delete of source and create of destination
+            if not is_excluded(event.src_path):
+                self._process_event(event.src_path, "delete")
+            if not is_excluded(event.dest_path):
+                self._process_event(event.dest_path, "create")
+        elif not is_excluded(event.src_path):
+            self._process_event(event.src_path, operation)
     
     def _process_event(self, file_path, operation):
         """
@@ -68,31 +97,28 @@ class FileSystemEventProcessor(FileSystemEventHandler):
             file_path (str): Path to the file
             operation (str): Operation type (create, modify, delete)
         """
-        # Skip if path is excluded
-        if self.collector.is_path_excluded(file_path):
-            return
-        
         try:
-            path = Path(file_path)
-            file_type = path.suffix[1:] if path.suffix else ""
-            size = path.stat().st_size if operation != "delete" and path.exists() else 0
+            file_type = os.path.splitext(file_path)[1][1:]
+            
+            # One stat call; a file removed since the event simply has no size
+            size = 0
+            if operation != "delete":
+                try:
+                    size = os.stat(file_path).st_size
+                except FileNotFoundError:
+                    pass
             
-            event = {
-                "timestamp": time.time(),
-                "operation": operation,
-                "path": file_path,
-                "file_type": file_type,
-                "size": size,
-                "app": ""  # Would require additional system info to determine
-            }
+            # app would require additional system info to determine
+            event = FileEvent(time.time_ns(), operation, file_path, file_type, size)
             
-            logger.debug(f"File event: {operation} {file_path}")
+            # Avoid formatting per event unless DEBUG is actually on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("File event: %s %s", operation, file_path)
             
-            # Store the event if storage is available
-            if self.collector.storage:
-                self.collector.storage.store_events([event], "file_events")
+            # Buffer the event; the collector flushes to storage in batches
+            self.collector.buffer_event(event)
         except Exception as e:
-            logger.error(f"Error processing file event: {e}")
+            logger.error("Error processing file event: %s", e)
 
 
 class FileSystemCollector(DataCollector):
@@ -110,11 +136,31 @@ class FileSystemCollector(DataCollector):
         # Extract configuration
         self.paths = self._resolve_paths(config.get("paths", []))
         self.exclude_paths = self._resolve_paths(config.get("exclude_paths", []))
-        self.monitored_events = config.get("events", ["create", "modify", "delete"])
+        self.monitored_events = frozenset(config.get("events", ["create", "modify", "delete"]))
+        
+        # Operations the event handler acts on; creates are always recorded
+        self._enabled_ops = self.monitored_events | {"create"}
+        
+        # Excluded directories as component tuples, e.g. "/a/b" -> ("", "a", "b"),
+        # so a lookup costs one set probe per distinct exclusion depth
+        self._exclude_components = {tuple(p.rstrip(os.sep).split(os.sep)) for p in self.exclude_paths}
+        self._exclude_depths = sorted({len(parts) for parts in self._exclude_components})
+        
+        # Busy files fire many events for the same path, so memoize per instance
+        self._excluded = functools.lru_cache(maxsize=4096)(self._check_excluded)
+        
+        # Event buffer, drained to storage in batches by a flusher thread
+        self._buffer = deque()
+        self._buffer_lock = threading.Lock()
+        self._batch_size = config.get("batch_size", 256)
+        self._flush_interval = config.get("flush_interval", 1.0)
+        self._flush_event = threading.Event()
+        self._shutdown = False
+        self._flush_thread = None
         
         # Initialize watchdog components
         self.event_handler = FileSystemEventProcessor(self)
-        self.observers = []
+        self._observer = None
     
     def _resolve_paths(self, paths):
         """
@@ -124,15 +170,9 @@ class FileSystemCollector(DataCollector):
             paths (list): List of path strings
             
         Returns:
-            list: Resolved absolute paths
+            list: Resolved absolute path strings
         """
-        resolved = []
-        for path in paths:
-            # Expand user directory if needed
-            if path.startswith("~"):
-                path = str(Path(path).expanduser())
-            resolved.append(Path(path).resolve())
-        return resolved
+        return [os.path.realpath(os.path.expanduser(path)) for path in paths]
     
     def is_path_excluded(self, path):
         """
@@ -144,15 +184,80 @@ class FileSystemCollector(DataCollector):
         Returns:
             bool: True if path should be excluded
         """
-        path = Path(path)
+        return self._excluded(path)
+    
+    def _check_excluded(self, path):
+        """Uncached exclusion check backing is_path_excluded."""
+        parts = tuple(path.split(os.sep))
         
-        # Check against exclusion paths
-        for exclude in self.exclude_paths:
-            if str(path).startswith(str(exclude)):
+        # Only strict prefixes count: the path must lie inside the excluded directory
+        for depth in self._exclude_depths:
+            if depth >= len(parts):
+                break
+            if parts[:depth] in self._exclude_components:
                 return True
         
         return False
     
+    def buffer_event(self, event):
+        """
+        Queue an event for the next batch write.
+        
+        Args:
+            event (FileEvent): File event record
+        """
+        with self._buffer_lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self._batch_size
+        
+        if full:
+            self._flush_event.set()
+    
+    def flush(self):
+        """
+        Write all buffered events to storage in a single transaction.
+        
+        Returns:
+            int: Number of events written
+        """
+        with self._buffer_lock:
+            if not self._buffer:
+                return 0
+            batch = list(self._buffer)
+            self._buffer.clear()
+        
+        if not self.storage:
+            return len(batch)
+        
+        # A backlog larger than one batch is written as several
+        # executemany calls inside a single transaction
+        written = 0
+        for i in range(0, len(batch), self._batch_size):
+            chunk = batch[i:i + self._batch_size]
+            if self.storage.store_events(chunk, "file_events", commit=False):
+                written += len(chunk)
+            elif not self.storage.has_pending_writes:
+                # A database error rolled back the chunks written before this
+                # one too; malformed chunks are rejected without touching them
+                written = 0
+        
+        if not self.storage.flush():
+            written = 0
+        
+        if written < len(batch):
+            logger.error(f"Dropped {len(batch) - written} of {len(batch)} file events")
+        return written
+    
+    def _flush_loop(self):
+        """Flush buffered events when the batch fills or the interval elapses."""
+        while not self._shutdown:
+            self._flush_event.wait(self._flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing file events: {e}")
+    
     def start(self):
         """
         Start collecting file system events.
@@ -165,18 +270,26 @@ class FileSystemCollector(DataCollector):
             return True
         
         try:
-            # Create an observer for each path
+            # A single observer drives the watches for every path
+            self._observer = Observer()
             for path in self.paths:
-                if not path.exists():
-                    logger.warning(f"Path does not exist, creating: {path}")
-                    path.mkdir(parents=True, exist_ok=True)
+                # makedirs with exist_ok is idempotent, so no separate exists() check
+                try:
+                    os.makedirs(path, exist_ok=True)
+                except OSError as e:
+                    logger.error(f"Could not create watched directory {path}: {e}")
+                    raise
                 
-                observer = Observer()
-                observer.schedule(self.event_handler, str(path), recursive=True)
-                observer.start()
-                self.observers.append(observer)
+                self._observer.schedule(self.event_handler, path, recursive=True)
                 logger.info(f"Watching directory: {path}")
             
+            self._observer.start()
+            
+            # Start the background flusher
+            self._shutdown = False
+            self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flush_thread.start()
+            
             self.is_running = True
             logger.info("File system collector started")
             return True
@@ -197,15 +310,19 @@ class FileSystemCollector(DataCollector):
             return True
         
         try:
-            # Stop all observers
-            for observer in self.observers:
-                observer.stop()
+            # Stop the observer and wait for it to finish
+            self._observer.stop()
+            self._observer.join()
             
-            # Wait for observers to finish
-            for observer in self.observers:
-                observer.join()
+            # Stop the flusher and write out anything still buffered
+            self._shutdown = True
+            self._flush_event.set()
+            if self._flush_thread:
+                self._flush_thread.join()
+                self._flush_thread = None
+            self.flush()
             
-            self.observers = []
+            self._observer = None
             self.is_running = False
             logger.info("File system collector stopped")
             return True
@@ -222,7 +339,7 @@ class FileSystemCollector(DataCollector):
             dict: Schema definition
         """
         return {
-            "timestamp": "float",  # UNIX timestamp
+            "timestamp": "int",    # UNIX timestamp in nanoseconds
             "operation": "str",    # create, modify, delete
             "path": "str",         # Absolute file path
             "file_type": "str",    # File extension
@@ -1,10 +1,45 @@
 # Collection Manager
 import logging
+import functools
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 logger = logging.getLogger("ai-framework.collectors.manager")
 
+# Log wording for each collector action
+_ACTION_WORDS = {
+    "start": ("Started", "starting"),
+    "stop": ("Stopped", "stopping"),
+}
+
+@functools.cache
+def _collector_class(collector_name):
+    """
+    Import and return the collector class for a configured collector name.
+    
+    The class is looked up in src.collectors.<name> and is assumed to be
+    named after it, e.g. file_system -> FileSystemCollector.
+    
+    Args:
+        collector_name (str): Collector name from the configuration
+        
+    Returns:
+        type: Collector class
+        
+    Raises:
+        ImportError: If the collector module cannot be imported
+        AttributeError: If the module has no matching collector class
+    """
+    module_name = f"src.collectors.{collector_name}"
+    module = importlib.import_module(module_name)
+    
+    class_name = "".join(word.capitalize() for word in collector_name.split("_")) + "Collector"
+    if not hasattr(module, class_name):
+        raise AttributeError(f"Collector class {class_name} not found in {module_name}")
+    
+    return getattr(module, class_name)
+
 class CollectionManager:
     """Manages data collectors."""
     
@@ -37,24 +72,16 @@ class CollectionManager:
                 continue
             
             try:
-                # Import the collector module
-                module_name = f"src.collectors.{collector_name}"
-                
                 try:
-                    module = importlib.import_module(module_name)
+                    collector_class = _collector_class(collector_name)
                 except ImportError as e:
-                    logger.error(f"Could not import collector {module_name}: {e}")
+                    logger.error(f"Could not import collector src.collectors.{collector_name}: {e}")
                     continue
-                
-                # Find the collector class (assume it's named XxxCollector)
-                class_name = "".join(word.capitalize() for word in collector_name.split("_")) + "Collector"
-                
-                if not hasattr(module, class_name):
-                    logger.error(f"Collector class {class_name} not found in {module_name}")
+                except AttributeError as e:
+                    logger.error(str(e))
                     continue
                 
                 # Instantiate the collector
-                collector_class = getattr(module, class_name)
                 collector = collector_class(collector_config)
                 
                 # Set storage
@@ -69,6 +96,50 @@ class CollectionManager:
         
         return len(self.collectors) > 0
     
+    def _run_on_collector(self, name, collector, action):
+        """
+        Start or stop a single collector, logging the outcome.
+        
+        Args:
+            name (str): Collector name
+            collector: Collector instance
+            action (str): "start" or "stop"
+            
+        Returns:
+            bool: True if the action succeeded
+        """
+        past, progressive = _ACTION_WORDS[action]
+        try:
+            if getattr(collector, action)():
+                logger.info(f"{past} collector: {name}")
+                return True
+            logger.error(f"Failed to {action} collector: {name}")
+        except Exception as e:
+            logger.error(f"Error {progressive} collector {name}: {e}")
+        return False
+    
+    def _run_on_all(self, action):
+        """
+        Start or stop all collectors concurrently.
+        
+        Args:
+            action (str): "start" or "stop"
+            
+        Returns:
+            bool: True if the action succeeded for every collector
+        """
+        if not self.collectors:
+            return True
+        
+        # Collectors may block on I/O (e.g. networked mounts), so run them in parallel
+        with ThreadPoolExecutor(max_workers=max(4, len(self.collectors))) as pool:
+            results = list(pool.map(
+                lambda item: self._run_on_collector(item[0], item[1], action),
+                self.collectors.items()
+            ))
+        
+        return all(results)
+    
     def start_collectors(self):
         """
         Start all collectors.
@@ -77,20 +148,7 @@ class CollectionManager:
             bool: True if all collectors started successfully
         """
         logger.info("Starting collectors")
-        
-        success = True
-        for name, collector in self.collectors.items():
-            try:
-                if collector.start():
-                    logger.info(f"Started collector: {name}")
-                else:
-                    logger.error(f"Failed to start collector: {name}")
-                    success = False
-            except Exception as e:
-                logger.error(f"Error starting collector {name}: {e}")
-                success = False
-        
-        return success
+        return self._run_on_all("start")
     
     def stop_collectors(self):
         """
@@ -100,20 +158,7 @@ class CollectionManager:
             bool: True if all collectors stopped successfully
         """
         logger.info("Stopping collectors")
-        
-        success = True
-        for name, collector in self.collectors.items():
-            try:
-                if collector.stop():
-                    logger.info(f"Stopped collector: {name}")
-                else:
-                    logger.error(f"Failed to stop collector: {name}")
-                    success = False
-            except Exception as e:
-                logger.error(f"Error stopping collector {name}: {e}")
-                success = False
-        
-        return success
+        return self._run_on_all("stop")
     
     def get_collector(self, name):
         """
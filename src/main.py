@@ -6,18 +6,15 @@ Main entry point for the application
 
 import sys
 import os
+import signal
 import logging
+import threading
 from pathlib import Path
 
 # Add src directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config.config_manager import ConfigManager
-from data_collection.activity_monitor import ActivityMonitor
-from data_processing.data_processor import DataProcessor
-from machine_learning.model_trainer import ModelTrainer
-from recommendation_engine.recommender import Recommender
-from ui.interface import UserInterface
 
 class ProductivityAssistant:
     """Main application class for the AI Personal Productivity Assistant"""
@@ -43,11 +40,21 @@ class ProductivityAssistant:
 
             self.logger.info("Initializing AI Personal Productivity Assistant...")
 
-            # Initialize components
+            # Initialize components, importing each only when needed so that
+            # heavy dependencies (pandas, sklearn, Qt) are not loaded up front
+            from data_collection.activity_monitor import ActivityMonitor
             self.activity_monitor = ActivityMonitor(self.config)
+
+            from data_processing.data_processor import DataProcessor
             self.data_processor = DataProcessor(self.config)
+
+            from machine_learning.model_trainer import ModelTrainer
             self.model_trainer = ModelTrainer(self.config)
+
+            from recommendation_engine.recommender import Recommender
             self.recommender = Recommender(self.config)
+
+            from ui.interface import UserInterface
             self.ui = UserInterface(self.config)
 
             self.logger.info("All components initialized successfully")
@@ -126,11 +133,21 @@ def main():
     app = ProductivityAssistant()
     app.initialize()
 
+    # Keep the application running until SIGINT/SIGTERM
+    stop_event = threading.Event()
+
+    def _handle_signal(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
     try:
         app.start()
-        # Keep the application running
-        input("Press Enter to stop the application...\n")
-    except KeyboardInterrupt:
+        print("Press Ctrl+C to stop the application...")
+        # Wait in short slices so signals are handled promptly on every platform
+        while not stop_event.wait(1.0):
+            pass
         print("\nShutting down gracefully...")
     finally:
         app.stop()
@@ -1,17 +1,321 @@
 # Database Storage Manager
 import os
 import json
+import math
+import hashlib
 import sqlite3
 import logging
+import queue
+import threading
 import time
+from contextlib import contextmanager
+from collections.abc import Mapping
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 logger = logging.getLogger("ai-framework.storage.database")
 
+# Connection tuning: WAL lets readers run alongside the writer, and
+# synchronous=NORMAL drops the per-commit fsync of the rollback journal
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Read-only connections inherit WAL from the database file and only need
+# their per-connection settings
+_READER_PRAGMAS = """
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Timestamps are stored as INTEGER microseconds since the epoch and exposed
+# to callers as float seconds
+_US_PER_SECOND = 1_000_000
+
+# Rows sampled per index when refreshing planner statistics, which keeps
+# ANALYZE cheap on large tables
+_ANALYSIS_LIMIT = 400
+
+# Schema version, tracked in PRAGMA user_version
+_SCHEMA_VERSION = 3
+
+# Models are compressed in the blob store when zstandard is installed; the
+# codec is recorded per row so either kind of blob can be read back
+_MODEL_COMPRESSION = "zstd" if zstd is not None else None
+
+# zstd contexts must not be shared between threads, so each thread that
+# reads or writes models keeps its own
+_zstd_contexts = threading.local()
+
+def _zstd_compressor():
+    """Return this thread's zstd compressor."""
+    cctx = getattr(_zstd_contexts, "compressor", None)
+    if cctx is None:
+        cctx = _zstd_contexts.compressor = zstd.ZstdCompressor(level=3)
+    return cctx
+
+def _zstd_decompressor():
+    """Return this thread's zstd decompressor."""
+    dctx = getattr(_zstd_contexts, "decompressor", None)
+    if dctx is None:
+        dctx = _zstd_contexts.decompressor = zstd.ZstdDecompressor()
+    return dctx
+
+# Blob file name suffix for each codec
+_BLOB_SUFFIXES = {None: "", "zstd": ".zst"}
+
+# Table definitions, also used to rebuild tables during migrations
+_TABLE_DDL = {
+    "file_events": '''
+        CREATE TABLE IF NOT EXISTS file_events (
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER,
+            operation TEXT,
+            path TEXT,
+            file_type TEXT,
+            size INTEGER,
+            app TEXT
+        )
+    ''',
+    "app_events": '''
+        CREATE TABLE IF NOT EXISTS app_events (
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER,
+            app_name TEXT,
+            window_title TEXT,
+            focus_duration INTEGER,
+            active BOOLEAN
+        )
+    ''',
+    "system_events": '''
+        CREATE TABLE IF NOT EXISTS system_events (
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER,
+            cpu_percent REAL,
+            memory_percent REAL,
+            active_window TEXT,
+            state TEXT
+        )
+    ''',
+    "features": '''
+        CREATE TABLE IF NOT EXISTS features (
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER,
+            feature_type TEXT,
+            feature_data TEXT
+        )
+    ''',
+    "models": '''
+        CREATE TABLE IF NOT EXISTS models (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            version TEXT,
+            created_at REAL,
+            model_type TEXT,
+            serialized_sha256 TEXT,
+            compression TEXT,
+            performance_metrics TEXT
+        )
+    ''',
+}
+
+# Indexes for the time-range and latest-first lookups, per table. The
+# timestamp indexes give bounded ranges a direct seek and return rows
+# already in order, so events are not bucketed by day on top of them.
+_INDEX_DDL = {
+    "file_events": "CREATE INDEX IF NOT EXISTS idx_file_events_ts ON file_events(timestamp)",
+    "app_events": "CREATE INDEX IF NOT EXISTS idx_app_events_ts ON app_events(timestamp)",
+    "system_events": "CREATE INDEX IF NOT EXISTS idx_system_events_ts ON system_events(timestamp)",
+    "features": (
+        "CREATE INDEX IF NOT EXISTS idx_features_type_ts ON features(feature_type, timestamp DESC)"
+    ),
+    "models": "CREATE INDEX IF NOT EXISTS idx_models_name_created ON models(name, created_at DESC)",
+}
+
+# Tables and indexes, created in a single transaction
+_SCHEMA_DDL = ";\n".join(
+    ["BEGIN IMMEDIATE", *_TABLE_DDL.values(), *_INDEX_DDL.values(), "COMMIT"]
+) + ";"
+
+# SQL is kept in constants so every call passes identical text and hits
+# sqlite3's prepared-statement cache.
+# File event timestamps arrive in nanoseconds; other events use seconds.
+INSERT_FILE_EVENT_SQL = '''
+    INSERT INTO file_events
+    (timestamp, operation, path, file_type, size, app)
+    VALUES (? / 1000, ?, ?, ?, ?, ?)
+'''
+
+INSERT_APP_EVENT_SQL = '''
+    INSERT INTO app_events
+    (timestamp, app_name, window_title, focus_duration, active)
+    VALUES (CAST(round(? * 1000000) AS INTEGER), ?, ?, ?, ?)
+'''
+
+INSERT_SYS_EVENT_SQL = '''
+    INSERT INTO system_events
+    (timestamp, cpu_percent, memory_percent, active_window, state)
+    VALUES (CAST(round(? * 1000000) AS INTEGER), ?, ?, ?, ?)
+'''
+
+INSERT_FEATURE_SQL = '''
+    INSERT INTO features
+    (timestamp, feature_type, feature_data)
+    VALUES (?, ?, ?)
+'''
+
+INSERT_MODEL_SQL = '''
+    INSERT INTO models
+    (name, version, created_at, model_type, serialized_sha256, compression, performance_metrics)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Model metadata queries never touch the serialized model itself
+SELECT_MODEL_VERSION_SQL = '''
+    SELECT id, name, version, created_at, model_type, serialized_sha256, compression, performance_metrics
+    FROM models WHERE name = ? AND version = ?
+'''
+
+SELECT_LATEST_MODEL_SQL = '''
+    SELECT id, name, version, created_at, model_type, serialized_sha256, compression, performance_metrics
+    FROM models WHERE name = ? ORDER BY created_at DESC LIMIT 1
+'''
+
+SELECT_MODEL_BLOB_SQL = '''
+    SELECT serialized_sha256, compression FROM models WHERE id = ?
+'''
+
+# Feature rows are assembled into a single JSON array by SQLite so the whole
+# result is decoded with one call. SQLite does not promise the aggregate
+# keeps the subquery's order, so callers sort the decoded list. Timestamps
+# stay integer microseconds here, since SQLite renders REALs in JSON with
+# only 15 significant digits.
+_SELECT_FEATURES_TEMPLATE = '''
+    SELECT json_group_array(json_object(
+        'id', id,
+        'timestamp', timestamp,
+        'feature_type', feature_type,
+        'feature_data', json(feature_data)
+    ))
+    FROM (
+        SELECT id, timestamp, feature_type, feature_data FROM features
+        {where}
+        ORDER BY timestamp DESC LIMIT ?
+    )
+'''
+
+SELECT_FEATURES_SQL = _SELECT_FEATURES_TEMPLATE.format(where="")
+SELECT_FEATURES_BY_TYPE_SQL = _SELECT_FEATURES_TEMPLATE.format(where="WHERE feature_type = ?")
+
+# Row-by-row fallback for when a stored document is not valid JSON to SQLite
+# (e.g. NaN written by older versions), which fails the aggregate as a whole
+_SELECT_FEATURE_ROWS_TEMPLATE = '''
+    SELECT id, timestamp, feature_type, feature_data FROM features
+    {where}
+    ORDER BY timestamp DESC LIMIT ?
+'''
+
+SELECT_FEATURE_ROWS_SQL = _SELECT_FEATURE_ROWS_TEMPLATE.format(where="")
+SELECT_FEATURE_ROWS_BY_TYPE_SQL = _SELECT_FEATURE_ROWS_TEMPLATE.format(where="WHERE feature_type = ?")
+
+# Documents SQLite cannot parse (e.g. NaN written by older versions) are
+# skipped; json_extract would otherwise fail the whole statement
+SELECT_FEATURE_FIELD_SQL = '''
+    SELECT json_extract(feature_data, ?) FROM features
+    WHERE feature_type = ? AND json_valid(feature_data)
+    ORDER BY timestamp DESC LIMIT ?
+'''
+
+# Insert statement column order for each event table
+_FILE_EVENT_FIELDS = ("timestamp", "operation", "path", "file_type", "size", "app")
+_APP_EVENT_FIELDS = ("timestamp", "app_name", "window_title", "focus_duration", "active")
+_SYS_EVENT_FIELDS = ("timestamp", "cpu_percent", "memory_percent", "active_window", "state")
+
+# Explicit column lists for each event table, with timestamps in seconds
+_EVENT_COLUMNS = {
+    "file_events": "id, timestamp / 1e6 AS timestamp, operation, path, file_type, size, app",
+    "app_events": "id, timestamp / 1e6 AS timestamp, app_name, window_title, focus_duration, active",
+    "system_events": "id, timestamp / 1e6 AS timestamp, cpu_percent, memory_percent, active_window, state",
+}
+
+# Event queries per table, read one page at a time. Only these prebuilt
+# statements are executed, so table names are never interpolated from caller
+# input. The stored column is qualified with the table name so filtering and
+# ordering use it (and its index) rather than the seconds alias. Each page
+# resumes after the (timestamp, id) of the last row of the previous one.
+_SELECT_EVENTS_PAGE_SQL = {
+    table: (
+        f"SELECT {columns}, {table}.timestamp AS timestamp_us FROM {table} "
+        f"WHERE ({table}.timestamp, {table}.id) > (?, ?) AND {table}.timestamp <= ? "
+        f"ORDER BY {table}.timestamp, {table}.id LIMIT ?"
+    )
+    for table, columns in _EVENT_COLUMNS.items()
+}
+
+# Rows fetched per reader checkout when iterating over events
+_EVENT_PAGE_SIZE = 1000
+
+def _finite_or_none(obj):
+    """Return obj with NaN and infinite floats replaced by None, recursively."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite_or_none(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(value) for value in obj]
+    return obj
+
+def _json_dumps(obj):
+    """
+    Serialize to a JSON string, using orjson when it is installed.
+    
+    NaN and infinities are written as null on both paths, since SQLite's
+    JSON functions reject the bare NaN/Infinity the json module emits.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    try:
+        return json.dumps(obj, allow_nan=False)
+    except ValueError:
+        return json.dumps(_finite_or_none(obj))
+
+def _json_loads(data):
+    """Parse a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class StorageManager:
     """Manage data storage and retrieval."""
     
+    # Insert statement and parameter row builders for each event table; rows
+    # are built in C from dicts by key and from records (e.g. FileEvent) by
+    # attribute
+    _INSERTERS = {
+        table: (sql, itemgetter(*fields), attrgetter(*fields))
+        for table, sql, fields in (
+            ("file_events", INSERT_FILE_EVENT_SQL, _FILE_EVENT_FIELDS),
+            ("app_events", INSERT_APP_EVENT_SQL, _APP_EVENT_FIELDS),
+            ("system_events", INSERT_SYS_EVENT_SQL, _SYS_EVENT_FIELDS),
+        )
+    }
+    
     def __init__(self, config):
         """
         Initialize storage manager.
@@ -34,102 +338,361 @@ class StorageManager:
             os.makedirs(db_dir)
         
         self.db_path = db_path
+        
+        # Serialized models live outside the database, named by their SHA-256
+        self.blob_dir = os.path.join(db_dir, "blobs")
+        
+        # One writer connection plus a pool of read-only connections; WAL
+        # lets the readers run concurrently with the writer
         self.conn = None
+        self._read_pool_size = config.get("read_connections", 4)
+        self._readers = None
+        self._read_timeout = config.get("read_timeout", 30)
+        self._write_lock = threading.RLock()
+        self._deferred_holds = 0
     
     def initialize(self):
         """
         Initialize storage and create schema if needed.
         
+        The database runs in WAL mode, so <db_path>-wal and <db_path>-shm
+        files will appear next to the database while it is open.
+        
         Returns:
             bool: True if successful
         """
         try:
-            # Connect to database
-            self.conn = sqlite3.connect(self.db_path)
+            # Connect the writer; transactions are managed explicitly, and
+            # collectors write from their own threads
+            self.conn = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+                timeout=30
+            )
+            self.conn.row_factory = sqlite3.Row
+            self.conn.executescript(_PRAGMAS)
             
             # Create tables if they don't exist
             self._create_schema()
+            self.optimize()
+            
+            # Open the read-only connections once the schema is in place
+            self._readers = queue.Queue()
+            read_uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            for _ in range(self._read_pool_size):
+                reader = sqlite3.connect(
+                    read_uri,
+                    uri=True,
+                    check_same_thread=False,
+                    cached_statements=256,
+                    timeout=30
+                )
+                reader.row_factory = sqlite3.Row
+                reader.executescript(_READER_PRAGMAS)
+                self._readers.put(reader)
             
             logger.info(f"Storage initialized: {self.db_path}")
             return True
             
-        except Exception as e:
+        except (sqlite3.Error, OSError) as e:
             logger.error(f"Error initializing storage: {e}")
             return False
     
-    def _create_schema(self):
-        """Create database schema if it doesn't exist."""
+    def optimize(self):
+        """
+        Refresh the query planner's statistics.
+        
+        Runs at startup and on close. PRAGMA optimize would skip these tables,
+        since it only considers tables this connection has queried and the
+        writer only inserts, so a sampled ANALYZE is run instead.
+        
+        Returns:
+            bool: True if successful
+        """
+        if not self.conn:
+            logger.error("Database not initialized")
+            return False
+        
+        try:
+            with self._transaction() as cursor:
+                cursor.execute(f"PRAGMA analysis_limit = {_ANALYSIS_LIMIT}")
+                cursor.execute("ANALYZE")
+            return True
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error refreshing planner statistics: {e}")
+            return False
+    
+    def close(self):
+        """Close the writer and all reader connections."""
+        if self.conn:
+            self.flush()
+            self.optimize()
+        
+        if self._readers is not None:
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
+            self._readers = None
+        
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+    
+    @contextmanager
+    def _reader(self):
+        """
+        Check out a read-only connection from the pool.
+        
+        Waits up to read_timeout seconds for one to be free if all readers
+        are in use.
+        
+        Yields:
+            sqlite3.Connection: Read-only connection
+            
+        Raises:
+            sqlite3.OperationalError: If no reader became free in time
+        """
+        try:
+            conn = self._readers.get(timeout=self._read_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a read connection") from None
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    @contextmanager
+    def _transaction(self, commit=True):
+        """
+        Run the enclosed statements in an explicit transaction.
+        
+        With commit=False the transaction and the write lock stay held after
+        the block, so later writes from the same thread join the same
+        transaction until flush() (or a committing write) ends it.
+        
+        Args:
+            commit (bool): Commit when the block completes
+            
+        Yields:
+            sqlite3.Cursor: Cursor to execute statements with
+        """
+        self._write_lock.acquire()
         cursor = self.conn.cursor()
+        try:
+            # Take the write lock up front rather than upgrading mid-transaction,
+            # which can fail with SQLITE_BUSY when other connections are reading
+            if not self.conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            if commit:
+                cursor.execute("COMMIT")
+        except BaseException:
+            # A failure, including a failed COMMIT, discards every write
+            # pending in this transaction
+            self._abort()
+            raise
         
-        # Create file events table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS file_events (
-                id INTEGER PRIMARY KEY,
-                timestamp REAL,
-                operation TEXT,
-                path TEXT,
-                file_type TEXT,
-                size INTEGER,
-                app TEXT
-            )
-        ''')
-        
-        # Create application events table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS app_events (
-                id INTEGER PRIMARY KEY,
-                timestamp REAL,
-                app_name TEXT,
-                window_title TEXT,
-                focus_duration INTEGER,
-                active BOOLEAN
-            )
-        ''')
-        
-        # Create system events table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS system_events (
-                id INTEGER PRIMARY KEY,
-                timestamp REAL,
-                cpu_percent REAL,
-                memory_percent REAL,
-                active_window TEXT,
-                state TEXT
-            )
-        ''')
-        
-        # Create features table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS features (
-                id INTEGER PRIMARY KEY,
-                timestamp REAL,
-                feature_type TEXT,
-                feature_data TEXT
-            )
-        ''')
-        
-        # Create models table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS models (
-                id INTEGER PRIMARY KEY,
-                name TEXT,
-                version TEXT,
-                created_at REAL,
-                model_type TEXT,
-                serialized_model BLOB,
-                performance_metrics TEXT
+        if commit:
+            self._release_deferred()
+            self._write_lock.release()
+        else:
+            self._deferred_holds += 1
+    
+    def _abort(self):
+        """Roll back the open transaction and release every write-lock hold."""
+        try:
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+        finally:
+            self._release_deferred()
+            self._write_lock.release()
+    
+    def _release_deferred(self):
+        """Drop the write-lock holds kept by commit=False writes."""
+        while self._deferred_holds:
+            self._deferred_holds -= 1
+            self._write_lock.release()
+    
+    @property
+    def has_pending_writes(self):
+        """bool: Whether writes made with commit=False are waiting for flush()."""
+        return self.conn is not None and self.conn.in_transaction
+    
+    def flush(self):
+        """
+        Commit writes made with commit=False.
+        
+        Must be called from the thread that made those writes.
+        
+        Returns:
+            bool: True if successful
+        """
+        if not self.conn:
+            logger.error("Database not initialized")
+            return False
+        
+        self._write_lock.acquire()
+        try:
+            if self.conn.in_transaction:
+                self.conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            # Don't leave the failed transaction open for later writes to join
+            logger.error(f"Error committing events: {e}")
+            self._abort()
+            return False
+        
+        self._release_deferred()
+        self._write_lock.release()
+        return True
+    
+    def _create_schema(self):
+        """Create database schema if it doesn't exist and migrate older versions."""
+        with self._write_lock:
+            self.conn.executescript(_SCHEMA_DDL)
+        
+        with self._transaction() as cursor:
+            # Version 1 moved timestamps from REAL seconds to INTEGER microseconds;
+            # rescale rows written by older versions
+            cursor.execute("PRAGMA user_version")
+            schema_version = cursor.fetchone()[0]
+            if schema_version < 1:
+                for table in ("file_events", "app_events", "system_events", "features"):
+                    self._migrate_integer_timestamps(cursor, table)
+            
+            # Version 2 moved model BLOBs out of the database into the blob store
+            if schema_version < 2:
+                self._migrate_model_blobs(cursor)
+            
+            # Version 3 records the compression of each model's blob; existing
+            # blobs stay uncompressed
+            if schema_version < 3:
+                columns = {row["name"] for row in cursor.execute("PRAGMA table_info(models)")}
+                if "compression" not in columns:
+                    cursor.execute("ALTER TABLE models ADD COLUMN compression TEXT")
+            
+            cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    
+    def _migrate_integer_timestamps(self, cursor, table):
+        """
+        Rebuild a table with an INTEGER timestamp column, rescaling seconds to
+        microseconds.
+        
+        Updating the values in place would leave the REAL column affinity,
+        which keeps storing every new timestamp as a float.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor in the migration transaction
+            table (str): Table to rebuild
+        """
+        old_table = f"{table}_v0"
+        columns = [row["name"] for row in cursor.execute(f"PRAGMA table_info({table})")]
+        selects = [
+            "CAST(round(timestamp * 1000000) AS INTEGER)" if column == "timestamp" else column
+            for column in columns
+        ]
+        
+        # Renaming carries the old indexes along; they go with the old table
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+        cursor.execute(_TABLE_DDL[table])
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(selects)} FROM {old_table}"
+        )
+        cursor.execute(f"DROP TABLE {old_table}")
+        cursor.execute(_INDEX_DDL[table])
+    
+    def _migrate_model_blobs(self, cursor):
+        """Move serialized models stored in the models table into the blob store."""
+        columns = {row["name"] for row in cursor.execute("PRAGMA table_info(models)")}
+        if "serialized_sha256" not in columns:
+            cursor.execute("ALTER TABLE models ADD COLUMN serialized_sha256 TEXT")
+        if "serialized_model" not in columns:
+            return
+        
+        # Move one BLOB at a time to keep memory bounded
+        ids = [row["id"] for row in cursor.execute(
+            "SELECT id FROM models WHERE serialized_model IS NOT NULL"
+        )]
+        for model_id in ids:
+            cursor.execute("SELECT serialized_model FROM models WHERE id = ?", (model_id,))
+            digest = self._write_blob(cursor.fetchone()[0])
+            cursor.execute(
+                "UPDATE models SET serialized_sha256 = ?, serialized_model = NULL WHERE id = ?",
+                (digest, model_id)
             )
-        ''')
+    
+    def _blob_path(self, digest, compression=None):
+        """Return the blob store path for a SHA-256 hex digest and codec."""
+        return os.path.join(self.blob_dir, digest[:2], digest + _BLOB_SUFFIXES[compression])
+    
+    def _write_blob(self, data, compression=None):
+        """
+        Write data to the content-addressed blob store.
         
-        self.conn.commit()
+        Args:
+            data (bytes): Data to store
+            compression (str, optional): Codec to store the data with ("zstd")
+            
+        Returns:
+            str: SHA-256 hex digest of the uncompressed data
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest, compression)
+        
+        # Identical content is already stored under the same name
+        if not os.path.exists(path):
+            if compression == "zstd":
+                data = _zstd_compressor().compress(data)
+            
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        
+        return digest
     
-    def store_events(self, events, event_type):
+    def _read_blob(self, digest, compression=None):
+        """
+        Read a blob from the content-addressed blob store.
+        
+        Args:
+            digest (str): SHA-256 hex digest of the uncompressed data
+            compression (str, optional): Codec the blob was stored with
+            
+        Returns:
+            bytes: Uncompressed blob contents
+        """
+        if compression == "zstd" and zstd is None:
+            raise RuntimeError(f"zstandard is required to read blob {digest}")
+        
+        with open(self._blob_path(digest, compression), "rb") as f:
+            data = f.read()
+        
+        if compression == "zstd":
+            # Report a corrupt or truncated blob like any other unreadable file
+            try:
+                return _zstd_decompressor().decompress(data)
+            except zstd.ZstdError as e:
+                raise OSError(f"Corrupt blob {digest}: {e}") from e
+        return data
+    
+    def store_events(self, events, event_type, commit=True):
         """
         Store collected events in database.
         
         Args:
-            events (list): List of event dictionaries
+            events (list): Event dictionaries, or records with one attribute
+                per field (e.g. FileEvent); all events in a call are of one
+                kind. File event timestamps are integer nanoseconds; all other
+                timestamps are seconds.
             event_type (str): Type of events (file_events, app_events, etc.)
+            commit (bool): Commit immediately. Pass False to group several
+                calls into one transaction, then call flush(). Malformed events
+                are rejected before the transaction is touched, but a database
+                error rolls back every write pending in it.
             
         Returns:
             bool: True if successful
@@ -138,63 +701,50 @@ class StorageManager:
             logger.error("Database not initialized")
             return False
         
+        if event_type not in self._INSERTERS:
+            logger.warning(f"Unknown event type: {event_type}")
+            return False
+        
+        sql, item_getter, attr_getter = self._INSERTERS[event_type]
+        getter = attr_getter if events and not isinstance(events[0], Mapping) else item_getter
+        
+        # Build every row first, so a malformed event fails only this call
+        # and leaves writes deferred by earlier calls intact
         try:
-            cursor = self.conn.cursor()
-            
-            if event_type == "file_events":
-                for event in events:
-                    cursor.execute('''
-                        INSERT INTO file_events
-                        (timestamp, operation, path, file_type, size, app)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        event["timestamp"],
-                        event["operation"],
-                        event["path"],
-                        event["file_type"],
-                        event["size"],
-                        event["app"]
-                    ))
-            
-            elif event_type == "app_events":
-                for event in events:
-                    cursor.execute('''
-                        INSERT INTO app_events
-                        (timestamp, app_name, window_title, focus_duration, active)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        event["timestamp"],
-                        event["app_name"],
-                        event["window_title"],
-                        event["focus_duration"],
-                        event["active"]
-                    ))
-            
-            elif event_type == "system_events":
-                for event in events:
-                    cursor.execute('''
-                        INSERT INTO system_events
-                        (timestamp, cpu_percent, memory_percent, active_window, state)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        event["timestamp"],
-                        event["cpu_percent"],
-                        event["memory_percent"],
-                        event["active_window"],
-                        event["state"]
-                    ))
-            
-            else:
-                logger.warning(f"Unknown event type: {event_type}")
-                return False
+            rows = list(map(getter, events))
+        except (KeyError, AttributeError, TypeError) as e:
+            logger.error(f"Malformed {event_type} event: {e}")
+            return False
+        
+        try:
+            with self._transaction(commit) as cursor:
+                cursor.executemany(sql, rows)
             
-            self.conn.commit()
             return True
             
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Error storing events: {e}")
             return False
     
+    def store_events_bulk(self, batches, event_type, batches_per_commit=16):
+        """
+        Store several event batches, committing once per group of batches.
+        
+        Args:
+            batches (iterable): Iterable of event lists
+            event_type (str): Type of events (file_events, app_events, etc.)
+            batches_per_commit (int): Number of batches per transaction
+            
+        Returns:
+            bool: True if all batches were stored
+        """
+        for i, events in enumerate(batches, 1):
+            if not self.store_events(events, event_type, commit=i % batches_per_commit == 0):
+                # The failed write rolled back the rest of its transaction
+                return False
+        
+        return self.flush()
+    
     def get_events(self, event_type, start_time=None, end_time=None):
         """
         Retrieve events for given time period.
@@ -207,52 +757,54 @@ class StorageManager:
         Returns:
             list: Events matching the criteria
         """
+        return list(self.iter_events(event_type, start_time, end_time))
+    
+    def iter_events(self, event_type, start_time=None, end_time=None):
+        """
+        Iterate over events for given time period without materializing them.
+        
+        Events are read in pages, and no read connection is held between
+        pages, so later pages may include events written after iteration
+        started.
+        
+        Args:
+            event_type (str): Type of events to retrieve
+            start_time (float, optional): Start timestamp
+            end_time (float, optional): End timestamp
+            
+        Yields:
+            dict: Events matching the criteria, oldest first
+        """
         if not self.conn:
             logger.error("Database not initialized")
-            return []
+            return
         
-        try:
-            cursor = self.conn.cursor()
-            query = f"SELECT * FROM {event_type}"
-            params = []
-            
-            # Add time filters if provided
-            if start_time or end_time:
-                query += " WHERE "
-                
-                if start_time:
-                    query += "timestamp >= ?"
-                    params.append(start_time)
-                
-                if start_time and end_time:
-                    query += " AND "
-                
-                if end_time:
-                    query += "timestamp <= ?"
-                    params.append(end_time)
-            
-            # Order by timestamp
-            query += " ORDER BY timestamp ASC"
-            
-            # Execute query
-            cursor.execute(query, params)
-            
-            # Get column names
-            columns = [description[0] for description in cursor.description]
-            
-            # Convert to list of dictionaries
-            events = []
-            for row in cursor.fetchall():
-                event = {}
-                for i, column in enumerate(columns):
-                    event[column] = row[i]
-                events.append(event)
-            
-            return events
-            
-        except Exception as e:
-            logger.error(f"Error retrieving events: {e}")
-            return []
+        if event_type not in _SELECT_EVENTS_PAGE_SQL:
+            logger.warning(f"Unknown event type: {event_type}")
+            return
+        
+        query = _SELECT_EVENTS_PAGE_SQL[event_type]
+        last_key = (-math.inf if start_time is None else start_time * _US_PER_SECOND, -1)
+        end = math.inf if end_time is None else end_time * _US_PER_SECOND
+        
+        while True:
+            # Return the reader before yielding, so a paused caller holds
+            # neither a pooled connection nor a WAL snapshot
+            try:
+                with self._reader() as conn:
+                    rows = conn.execute(query, (*last_key, end, _EVENT_PAGE_SIZE)).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Error retrieving events: {e}")
+                return
+            
+            for row in rows:
+                event = dict(row)
+                del event["timestamp_us"]
+                yield event
+            
+            if len(rows) < _EVENT_PAGE_SIZE:
+                return
+            last_key = (rows[-1]["timestamp_us"], rows[-1]["id"])
     
     def store_features(self, features, feature_type):
         """
@@ -269,31 +821,30 @@ class StorageManager:
             logger.error("Database not initialized")
             return False
         
+        # Convert DataFrame to dict if needed
+        if hasattr(features, "to_dict"):
+            features_dict = features.to_dict("records")
+        else:
+            features_dict = features
+        
+        # Serialize features to JSON
+        try:
+            serialized = _json_dumps(features_dict)
+        except TypeError as e:
+            logger.error(f"Features are not JSON serializable: {e}")
+            return False
+        
         try:
-            # Convert DataFrame to dict if needed
-            if hasattr(features, "to_dict"):
-                features_dict = features.to_dict("records")
-            else:
-                features_dict = features
-            
-            # Serialize features to JSON
-            serialized = json.dumps(features_dict)
-            
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO features
-                (timestamp, feature_type, feature_data)
-                VALUES (?, ?, ?)
-            ''', (
-                time.time(),
-                feature_type,
-                serialized
-            ))
-            
-            self.conn.commit()
+            with self._transaction() as cursor:
+                cursor.execute(INSERT_FEATURE_SQL, (
+                    time.time_ns() // 1000,
+                    feature_type,
+                    serialized
+                ))
+            
             return True
             
-        except Exception as e:
+        except sqlite3.Error as e:
             logger.error(f"Error storing features: {e}")
             return False
     
@@ -312,38 +863,91 @@ class StorageManager:
             logger.error("Database not initialized")
             return []
         
+        params = (feature_type, limit) if feature_type else (limit,)
+        
         try:
-            cursor = self.conn.cursor()
-            query = "SELECT * FROM features"
-            params = []
-            
-            if feature_type:
-                query += " WHERE feature_type = ?"
-                params.append(feature_type)
-            
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                try:
+                    if feature_type:
+                        cursor.execute(SELECT_FEATURES_BY_TYPE_SQL, params)
+                    else:
+                        cursor.execute(SELECT_FEATURES_SQL, params)
+                    
+                    # Decode every record in one call
+                    features = _json_loads(cursor.fetchone()[0])
+                    
+                except (sqlite3.OperationalError, ValueError):
+                    # A stored document SQLite cannot parse; decode row by row
+                    if feature_type:
+                        cursor.execute(SELECT_FEATURE_ROWS_BY_TYPE_SQL, params)
+                    else:
+                        cursor.execute(SELECT_FEATURE_ROWS_SQL, params)
+                    features = self._decode_feature_rows(cursor)
             
-            # Get column names
-            columns = [description[0] for description in cursor.description]
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving features: {e}")
+            return []
+        
+        # Most recent first, with timestamps in seconds
+        features.sort(key=itemgetter("timestamp"), reverse=True)
+        for feature in features:
+            feature["timestamp"] /= _US_PER_SECOND
+        
+        return features
+    
+    @staticmethod
+    def _decode_feature_rows(rows):
+        """
+        Decode feature rows one at a time, skipping documents that are not JSON.
+        
+        Args:
+            rows (iterable): Rows of (id, timestamp, feature_type, feature_data)
             
-            # Convert to list of dictionaries
-            features = []
-            for row in cursor.fetchall():
-                feature = {}
-                for i, column in enumerate(columns):
-                    if column == "feature_data":
-                        feature[column] = json.loads(row[i])
-                    else:
-                        feature[column] = row[i]
-                features.append(feature)
+        Returns:
+            list: Feature records with integer microsecond timestamps
+        """
+        features = []
+        for row in rows:
+            feature = dict(row)
+            try:
+                # The json module also accepts the NaN/Infinity older versions wrote
+                feature["feature_data"] = json.loads(feature["feature_data"])
+            except ValueError as e:
+                logger.warning(f"Skipping malformed feature record {feature['id']}: {e}")
+                continue
+            features.append(feature)
+        
+        return features
+    
+    def get_feature_field(self, feature_type, json_path, limit=100):
+        """
+        Retrieve a single field from stored features without decoding them.
+        
+        The field is extracted by SQLite's JSON1 functions, so scalar values
+        come back as native Python values; objects and arrays come back as
+        JSON text.
+        
+        Args:
+            feature_type (str): Type of features to read
+            json_path (str): JSON path of the field, e.g. "$.kind"
+            limit (int): Maximum number of records to return
             
-            return features
+        Returns:
+            list: Field values, most recent first
+        """
+        if not self.conn:
+            logger.error("Database not initialized")
+            return []
+        
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_FEATURE_FIELD_SQL, (json_path, feature_type, limit))
+                return [row[0] for row in cursor]
             
-        except Exception as e:
-            logger.error(f"Error retrieving features: {e}")
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving feature field: {e}")
             return []
     
     def store_model(self, name, version, model_type, serialized_model, metrics=None):
@@ -364,28 +968,31 @@ class StorageManager:
             logger.error("Database not initialized")
             return False
         
+        # Serialize metrics to JSON if provided
         try:
-            # Serialize metrics to JSON if provided
-            metrics_json = json.dumps(metrics) if metrics else None
-            
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO models
-                (name, version, created_at, model_type, serialized_model, performance_metrics)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                name,
-                version,
-                time.time(),
-                model_type,
-                serialized_model,
-                metrics_json
-            ))
-            
-            self.conn.commit()
+            metrics_json = _json_dumps(metrics) if metrics else None
+        except TypeError as e:
+            logger.error(f"Model metrics are not JSON serializable: {e}")
+            return False
+        
+        try:
+            # Keep the model bytes out of the database; the row stores the hash
+            digest = self._write_blob(serialized_model, _MODEL_COMPRESSION)
+            
+            with self._transaction() as cursor:
+                cursor.execute(INSERT_MODEL_SQL, (
+                    name,
+                    version,
+                    time.time(),
+                    model_type,
+                    digest,
+                    _MODEL_COMPRESSION,
+                    metrics_json
+                ))
+            
             return True
             
-        except Exception as e:
+        except (sqlite3.Error, OSError) as e:
             logger.error(f"Error storing model: {e}")
             return False
     
@@ -398,41 +1005,88 @@ class StorageManager:
             version (str, optional): Model version (latest if not specified)
             
         Returns:
-            dict: Model record or None if not found
+            dict: Model record, including the serialized_model bytes read
+                from the blob store, or None if not found
         """
-        if not self.conn:
-            logger.error("Database not initialized")
+        model = self.get_model_metadata(name, version)
+        if model is None:
             return None
         
         try:
-            cursor = self.conn.cursor()
-            query = "SELECT * FROM models WHERE name = ?"
-            params = [name]
+            model["serialized_model"] = self._read_blob(
+                model["serialized_sha256"], model["compression"]
+            )
+            return model
             
-            if version:
-                query += " AND version = ?"
-                params.append(version)
-            else:
-                query += " ORDER BY created_at DESC LIMIT 1"
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Error retrieving model: {e}")
+            return None
+    
+    def get_model_metadata(self, name, version=None):
+        """
+        Retrieve a stored model's metadata without loading the model itself.
+        
+        Args:
+            name (str): Model name
+            version (str, optional): Model version (latest if not specified)
             
-            cursor.execute(query, params)
-            row = cursor.fetchone()
+        Returns:
+            dict: Model record without serialized_model, or None if not found
+        """
+        if not self.conn:
+            logger.error("Database not initialized")
+            return None
+        
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                if version:
+                    cursor.execute(SELECT_MODEL_VERSION_SQL, (name, version))
+                else:
+                    cursor.execute(SELECT_LATEST_MODEL_SQL, (name,))
+                row = cursor.fetchone()
             
             if not row:
                 logger.warning(f"Model not found: {name} (version: {version})")
                 return None
             
             # Convert to dictionary
-            columns = [description[0] for description in cursor.description]
-            model = {}
-            for i, column in enumerate(columns):
-                if column == "performance_metrics" and row[i]:
-                    model[column] = json.loads(row[i])
-                else:
-                    model[column] = row[i]
+            model = dict(row)
+            if model["performance_metrics"]:
+                model["performance_metrics"] = _json_loads(model["performance_metrics"])
             
             return model
             
-        except Exception as e:
-            logger.error(f"Error retrieving model: {e}")
-            return None
\ No newline at end of file
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Error retrieving model metadata: {e}")
+            return None
+    
+    def get_model_blob(self, model_id):
+        """
+        Retrieve only the serialized model for a model record.
+        
+        Args:
+            model_id (int): Model record id, as returned in its metadata
+            
+        Returns:
+            bytes: Serialized model data or None if not found
+        """
+        if not self.conn:
+            logger.error("Database not initialized")
+            return None
+        
+        try:
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_MODEL_BLOB_SQL, (model_id,))
+                row = cursor.fetchone()
+            
+            if not row:
+                logger.warning(f"Model not found: id {model_id}")
+                return None
+            
+            return self._read_blob(row["serialized_sha256"], row["compression"])
+            
+        except (sqlite3.Error, OSError, RuntimeError) as e:
+            logger.error(f"Error retrieving model blob: {e}")
+            return None